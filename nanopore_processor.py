@@ -26,70 +26,421 @@ import subprocess
 import time
 import smtplib
 import logging
+import logging.handlers
 import argparse
 import signal
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import socket
+import selectors
+import json
+import hashlib
+import threading
+import re
+import stat
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+# PollingObserver is the default because inotify is unreliable on the network shares sequencers write to
 from watchdog.observers import Observer
-# Alternatively, use PollingObserver if needed
-# from watchdog.observers.polling import PollingObserver
-from watchdog.events import FileSystemEventHandler
+from watchdog.observers.polling import PollingObserver
+from watchdog.events import RegexMatchingEventHandler
 
+# Optional: inotify_simple enables the single-descriptor inotify watcher on Linux (--observer inotify)
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
 
-def setup_logging():
-    """Sets up the logging configuration."""
+# Module logger; its level check lets the per-event paths skip disabled messages cheaply
+log = logging.getLogger(__name__)
+
+# SMTP server used for email notifications
+SMTP_SERVER = "smtp.gmail.com"
+SMTP_PORT = 587
+
+# Subject and body of the notification email; {path} is the final summary file
+EMAIL_SUBJECT = "Experiment Summary File Generated"
+EMAIL_BODY_TEMPLATE = """The final summary file for the experiment has been generated:
+
+File Path: {path}
+
+Please check the final summary file for further details.
+"""
+
+# Full path to the Windows-installed Dorado, called from WSL. Used when the DORADO_BIN
+# environment variable is not set and this file exists; otherwise 'dorado' is looked up on the PATH.
+DORADO_PATH = "/mnt/c/Users/Lai Lab/Documents/dorado-0.7.3-win64/bin/dorado.exe"
+
+# Dorado subcommand, argument templates and output file name for each basecalling method.
+# Arguments are formatted with the experiment information plus pod5_folder and output_file;
+# methods whose arguments do not name the output file write it to stdout.
+BASECALLING_COMMANDS = {
+    "simplex": (
+        "basecaller",
+        ("{model}", "--models-directory", "{models_directory}", "--simplex",
+         "--kit", "{kit_name}", "--recursive", "{pod5_folder}", "--output", "{output_file}"),
+        "simplex_basecalled.bam",
+    ),
+    "duplex": (
+        "duplex",
+        ("{model}", "--models-directory", "{models_directory}", "--recursive",
+         "{pod5_folder}"),
+        "duplex_basecalled.bam",
+    ),
+}
+
+# Optional Dorado settings passed through when set; Dorado picks its platform default device
+# (e.g. Metal on Apple Silicon) and benchmarks batch sizes otherwise
+DORADO_OPTIONAL_OPTIONS = ("device", "batchsize", "chunksize")
+
+# Dorado's log line reporting the batch size it benchmarked for a device and model, e.g.
+# "cuda:0 using chunk size 9996, batch size 1472"
+DORADO_BATCH_SIZE_RE = re.compile(rb"(\S+) using chunk size \d+, batch size (\d+)")
+
+# Name of the file, stored in the experiment folder, that remembers processed summaries.
+# A JSON line is appended as each summary is processed, so a crash loses nothing.
+STATE_FILE_NAME = ".np_processed.jsonl"
+
+# A final summary file is processed once its size is unchanged over SUMMARY_SETTLE_SECONDS.
+# Files still being written are checked again after SUMMARY_RETRY_SECONDS, doubling up to
+# SUMMARY_RETRY_MAX_SECONDS, and given up on after SUMMARY_MAX_RETRIES checks (about an hour)
+SUMMARY_SETTLE_SECONDS = 0.5
+SUMMARY_RETRY_SECONDS = 5
+SUMMARY_RETRY_MAX_SECONDS = 600
+SUMMARY_MAX_RETRIES = 12
+
+# Matches a path whose last component is a final summary file, with either path separator.
+# Only events for these files are dispatched to the handler; pod5/fastq writes are dropped by watchdog.
+SUMMARY_PATH_RE = re.compile(r"(?:.*[\\/])?final_summary[^\\/]*\.txt\Z")
+
+# Number of top-level folders searched at once for existing summaries on startup
+STARTUP_SCAN_WORKERS = 8
+
+# MinKNOW output folders that hold reads and never contain a final summary file
+READ_FOLDER_NAMES = {"pod5", "fast5", "fastq_pass", "fastq_fail", "bam_pass", "bam_fail"}
+
+
+def setup_logging(log_file=None, verbose=False):
+    """
+    Sets up the logging configuration.
+
+    Logs go to a rotating log file at INFO level, or the level named by the
+    NP_LOGLEVEL environment variable (e.g. WARNING); an unknown level name
+    falls back to INFO with a warning. In verbose mode they are
+    also written to stdout, at DEBUG level for detailed output; otherwise
+    warnings and errors are also written to stderr, so that an interactive
+    run does not fail silently.
+
+    Args:
+        log_file (str): Path to the log file, or None to log to stdout only.
+        verbose (bool): Whether to log DEBUG messages to stdout as well.
+    """
+    handlers = []
+    if log_file:
+        handlers.append(logging.handlers.RotatingFileHandler(log_file, maxBytes=10 << 20, backupCount=5))
+    if verbose or not log_file:
+        handlers.append(logging.StreamHandler(sys.stdout))
+    else:
+        stderr_handler = logging.StreamHandler(sys.stderr)
+        stderr_handler.setLevel(logging.WARNING)
+        handlers.append(stderr_handler)
+    level_name = os.environ.get("NP_LOGLEVEL", "INFO").upper()
+    # getLevelName returns the level number for a known name, and a "Level ..." string otherwise
+    level = logging.getLevelName(level_name)
+    valid_level = isinstance(level, int)
+    if verbose:
+        level = logging.DEBUG
+    elif not valid_level:
+        level = logging.INFO
     logging.basicConfig(
-        level=logging.DEBUG,  # Set logging level to DEBUG for detailed output
+        level=level,
         format="%(asctime)s [%(levelname)s] %(message)s",
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
+        handlers=handlers
     )
+    if not valid_level:
+        log.warning("Unknown NP_LOGLEVEL %r, logging at INFO level.", level_name)
 
 
-class FileWatcher(FileSystemEventHandler):
+class FileWatcher(RegexMatchingEventHandler):
     """
     Watches for the creation of 'final_summary*.txt' files and triggers processing.
     """
 
     def __init__(self, experiment_info, observer):
+        super().__init__(regexes=[SUMMARY_PATH_RE.pattern], ignore_directories=True, case_sensitive=True)
         self.experiment_info = experiment_info
-        self.processed_files = set()
+        self.processed_seen = set()
+        self.state_path = os.path.join(experiment_info["path"], STATE_FILE_NAME)
         self.observer = observer
+        self._is_summary = SUMMARY_PATH_RE.match
+        self._smtp_user = os.environ.get('SMTP_USER')
+        self._smtp_password = os.environ.get('SMTP_PASSWORD')
+        if not self._smtp_user or not self._smtp_password:
+            log.error("SMTP credentials not found in environment variables. Email notifications are disabled.")
+        self._recipients = [email.strip() for email in experiment_info["email_recipients"].split(",")
+                            if email.strip()]
+        self._recipients_header = ", ".join(self._recipients)
+        if not self._recipients:
+            log.error("No email recipients given. Email notifications are disabled.")
+        self._smtp = None
+        self._smtp_lock = threading.Lock()
+        self._processes = set()
+        self._command_template = self._build_command_template()
+        # Run folder -> pod5 folder, for folders where one was found
+        self._pod5_cache = {}
+        self.stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._pending_changed = threading.Condition(self._lock)
+        self._queued = set()
+        # Number of times a queued file was found still being written: key -> count
+        self._retries = {}
+        # Files waiting to be handed to the workers, e.g. to be checked again: path -> (key, monotonic due time)
+        self._pending = {}
+        # Jobs run on worker threads so the watcher keeps handling events while basecalling runs for hours.
+        # By default one job runs at a time, as each one uses all GPUs.
+        self._executor = ThreadPoolExecutor(max_workers=experiment_info.get("parallel_jobs", 1))
+        # Emails are sent from their own thread so basecalling does not wait for the SMTP round trips
+        self._mailer = ThreadPoolExecutor(max_workers=1)
+        self.load_state()
+        self._scheduler = threading.Thread(target=self._drain_pending, name="scheduler", daemon=True)
+        self._scheduler.start()
 
     def on_created(self, event):
-        """Called when a file or directory is created."""
-        if event.is_directory:
+        """Called when a final summary file is created; other events are filtered out by watchdog."""
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("File created: %s", event.src_path)
+        self.handle_summary(event.src_path)
+
+    def on_moved(self, event):
+        """Called when a file is moved, e.g. when a summary is renamed into place."""
+        # Moves are dispatched if either path matches, so check that the destination is a summary
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("File moved: %s -> %s", event.src_path, event.dest_path)
+        if self._is_summary(event.dest_path):
+            self.handle_summary(event.dest_path)
+
+    def handle_summary(self, file_path):
+        """Queues a detected final summary file unless it has already been seen."""
+        if self.submit_file(file_path):
+            if log.isEnabledFor(logging.INFO):
+                log.info("Final summary file detected: %s", file_path)
+        elif log.isEnabledFor(logging.DEBUG):
+            log.debug("File %s has already been processed or queued.", file_path)
+
+    @staticmethod
+    def file_key(file_path):
+        """
+        Returns a compact 64-bit key identifying a file.
+
+        The key combines the file's inode number with its canonical folder (the
+        absolute path with symlinks resolved), so it survives the file being
+        renamed in place (e.g. a temporary file moved to its final name) and does
+        not depend on how the folder was given on the command line. The device number is not used, as it can change when a network
+        share is remounted. The built-in hash() is salted per process, so a
+        digest is used instead to keep keys valid across restarts.
+
+        Args:
+            file_path (str or bytes): The path to the file.
+
+        Returns:
+            int: The key identifying the file.
+
+        Raises:
+            FileNotFoundError: If the file no longer exists.
+        """
+        inode = os.stat(file_path).st_ino
+        folder = os.path.realpath(os.path.dirname(file_path))
+        digest = hashlib.blake2b(os.fsencode(folder), digest_size=8)
+        digest.update(inode.to_bytes(16, "big"))
+        return int.from_bytes(digest.digest(), "big")
+
+    def submit_file(self, file_path):
+        """
+        Queues a final summary file for processing on the worker thread.
+
+        Args:
+            file_path (str): The path to the final summary file.
+
+        Returns:
+            bool: True if the file was queued, False if it was already processed or queued.
+        """
+        try:
+            key = self.file_key(file_path)
+        except FileNotFoundError:
+            log.debug("File %s disappeared before it could be queued.", file_path)
+            return False
+        with self._pending_changed:
+            if key in self.processed_seen or key in self._queued:
+                return False
+            self._queued.add(key)
+            self._pending[file_path] = (key, time.monotonic())
+            self._pending_changed.notify()
+        return True
+
+    def _drain_pending(self):
+        """Hands pending files that are due to the worker threads."""
+        with self._pending_changed:
+            while not self.stopping.is_set():
+                now = time.monotonic()
+                due_files = [(path, key) for path, (key, due) in self._pending.items() if due <= now]
+                for file_path, key in due_files:
+                    del self._pending[file_path]
+                    self._executor.submit(self._run_job, file_path, key)
+                timeout = None
+                if self._pending:
+                    timeout = min(due for _, due in self._pending.values()) - now
+                self._pending_changed.wait(timeout)
+
+    def _run_job(self, file_path, key):
+        """Processes a queued file and records it as processed if it succeeds, unless the watcher is stopping."""
+        if self.stopping.is_set():
+            log.info("Skipping queued file %s because the watcher is stopping.", file_path)
             return
-        file_name = os.path.basename(event.src_path)
-        logging.info(f"File created: {event.src_path}")  # Log every created file
-        if file_name.endswith(".txt") and file_name.startswith("final_summary"):
-            if event.src_path not in self.processed_files:
-                logging.info(f"Final summary file detected: {event.src_path}")
-                self.process_file(event.src_path)
-                self.processed_files.add(event.src_path)
-            else:
-                logging.debug(f"File {event.src_path} has already been processed.")
+        try:
+            complete = self.is_file_complete(file_path)
+        except FileNotFoundError:
+            log.warning("File %s disappeared before it could be processed.", file_path)
+            with self._lock:
+                self._queued.discard(key)
+                self._retries.pop(key, None)
+            return
+        if not complete:
+            # Retry later rather than start hours of basecalling while MinKNOW is still writing
+            self._retry_later(file_path, key)
+            return
+        succeeded = self.process_file(file_path)
+        with self._lock:
+            self._queued.discard(key)
+            self._retries.pop(key, None)
+            if succeeded:
+                # Failed runs are left unrecorded, so they are processed again on the next start
+                self.processed_seen.add(key)
+                self.record_processed(file_path, key)
+
+    def _retry_later(self, file_path, key):
+        """
+        Queues a file that is still being written to be checked again, backing off between checks.
+
+        Files that are still incomplete after SUMMARY_MAX_RETRIES checks (e.g. the
+        empty summary of an aborted run) are given up on; the startup scan
+        queues them again when the watcher is restarted.
+
+        Args:
+            file_path (str): The path to the final summary file.
+            key (int): The key identifying the file (see file_key).
+        """
+        with self._pending_changed:
+            retries = self._retries.get(key, 0) + 1
+            if retries > SUMMARY_MAX_RETRIES:
+                del self._retries[key]
+                self._queued.discard(key)
+                log.warning("File %s is still incomplete after %d checks, giving up.", file_path, SUMMARY_MAX_RETRIES)
+                return
+            self._retries[key] = retries
+            delay = min(SUMMARY_RETRY_SECONDS * 2 ** (retries - 1), SUMMARY_RETRY_MAX_SECONDS)
+            self._pending[file_path] = (key, time.monotonic() + delay)
+            self._pending_changed.notify()
+        if retries == 1:
+            log.info("File %s is still being written, retrying in %d seconds.", file_path, delay)
+        else:
+            log.debug("File %s is still being written, retrying in %d seconds.", file_path, delay)
+
+    @staticmethod
+    def is_file_complete(file_path):
+        """
+        Checks whether a file has been completely written.
+
+        Args:
+            file_path (str): The path to the file.
+
+        Returns:
+            bool: True if the file is not empty and its size does not change over a short interval.
+
+        Raises:
+            FileNotFoundError: If the file no longer exists.
+        """
+        size = os.stat(file_path).st_size
+        if size == 0:
+            return False
+        time.sleep(SUMMARY_SETTLE_SECONDS)
+        return os.stat(file_path).st_size == size
+
+    def wait_for_jobs(self):
+        """
+        Waits for running jobs and pending emails to finish, then closes the SMTP connection.
+        Queued jobs are skipped once stop() has been called.
+        """
+        self._executor.shutdown(wait=True)
+        self._mailer.shutdown(wait=True)
+        with self._smtp_lock:
+            self._close_smtp()
+
+    def load_state(self):
+        """Loads the keys of previously processed files from the state file."""
+        if not os.path.isfile(self.state_path):
+            return
+        try:
+            with open(self.state_path, encoding="utf-8") as state_file:
+                for line in state_file:
+                    try:
+                        self.processed_seen.add(json.loads(line)["key"])
+                    except (ValueError, KeyError, TypeError):
+                        # A line cut short by a crash while it was written, or one that is not an entry
+                        log.warning("Ignoring invalid line in state file %s: %r", self.state_path, line)
+            log.info("Loaded %d processed file(s) from %s", len(self.processed_seen), self.state_path)
+        except OSError as e:
+            log.exception("Failed to load state file %s: %s", self.state_path, e)
+
+    def record_processed(self, file_path, key):
+        """
+        Appends a processed file to the state file.
+
+        Each file is written as soon as it is processed, so a crash or restart
+        never re-runs basecalling that has finished.
+
+        Args:
+            file_path (str): The path to the file, kept for reference.
+            key (int): The key identifying the file (see file_key).
+        """
+        try:
+            with open(self.state_path, "a", encoding="utf-8") as state_file:
+                state_file.write(json.dumps({"key": key, "path": file_path}) + "\n")
+        except OSError as e:
+            log.error("Failed to record processed file %s in %s: %s", file_path, self.state_path, e)
 
     def process_file(self, file_path):
-        """Processes the detected 'final_summary' file."""
+        """
+        Processes the detected 'final_summary' file.
+
+        Args:
+            file_path (str): The path to the final summary file.
+
+        Returns:
+            bool: True if the run was basecalled or its output already exists, False otherwise.
+        """
         try:
-            logging.info("Processing file...")
-            self.send_email_notification(file_path)
-            logging.info("Email notification sent.")
+            if self._command_template is not None and self._has_output(file_path):
+                # Basecalled by an earlier run whose completion was not recorded
+                log.info("Skipping %s, its basecalling output already exists.", file_path)
+                return True
+            log.info("Processing file...")
+            self._mailer.submit(self.send_email_notification, file_path)
+            log.info("Email notification queued.")
 
+            # Each run gets its own Dorado call, even when several finish together: Dorado takes one
+            # input folder and writes one BAM, so combining runs would mix flow cells in one file
             # Perform basecalling based on the experiment type
-            if self.experiment_info["basecalling_method"] == "simplex":
-                self.run_simplex_basecalling(file_path)
-            elif self.experiment_info["basecalling_method"] == "duplex":
-                self.run_duplex_basecalling(file_path)
+            if self._command_template is not None:
+                succeeded = self.run_basecalling(file_path)
             else:
-                logging.warning(f"Unknown basecalling method: {self.experiment_info['basecalling_method']}")
+                log.warning("Unknown basecalling method: %s", self.experiment_info.get("basecalling_method"))
+                succeeded = False
 
-            logging.info("File processing completed.")
+            log.info("File processing completed.")
+            return succeeded
 
         except Exception as e:
-            logging.exception(f"An error occurred while processing the file: {e}")
+            log.exception("An error occurred while processing the file: %s", e)
+            return False
 
     def send_email_notification(self, file_path):
         """
@@ -98,147 +449,486 @@ class FileWatcher(FileSystemEventHandler):
         Args:
             file_path (str): The path to the final summary file.
         """
-        logging.info("Sending email notification...")
-        subject = "Experiment Summary File Generated"
-        body = f"""The final summary file for the experiment has been generated:
+        if not self._smtp_user or not self._smtp_password or not self._recipients:
+            log.debug("Skipping email notification, no SMTP credentials or recipients.")
+            return
+        log.info("Sending email notification...")
+        body = EMAIL_BODY_TEMPLATE.format_map({"path": file_path})
 
-File Path: {file_path}
+        msg = EmailMessage()
+        msg["Subject"] = EMAIL_SUBJECT
+        smtp_user = self._smtp_user
+        smtp_password = self._smtp_password
+        msg["From"] = smtp_user
+        recipients = self._recipients
+        msg["To"] = self._recipients_header
+        msg.set_content(body)
 
-Please check the final summary file for further details.
-"""
+        with self._smtp_lock:
+            try:
+                try:
+                    server = self._get_smtp(smtp_user, smtp_password)
+                    server.send_message(msg, from_addr=smtp_user, to_addrs=recipients)
+                except smtplib.SMTPServerDisconnected:
+                    # The server may drop the connection between the keep-alive check and the send
+                    self._close_smtp()
+                    server = self._get_smtp(smtp_user, smtp_password)
+                    server.send_message(msg, from_addr=smtp_user, to_addrs=recipients)
+                log.info("Email notification sent successfully.")
+            except Exception as e:
+                self._close_smtp()
+                log.exception("Failed to send email: %s", e)
 
-        msg = MIMEMultipart()
-        msg["Subject"] = subject
-        smtp_user = os.environ.get('SMTP_USER')
-        smtp_password = os.environ.get('SMTP_PASSWORD')
-        if not smtp_user or not smtp_password:
-            logging.error("SMTP credentials not found in environment variables.")
-            return
+    def _get_smtp(self, smtp_user, smtp_password):
+        """
+        Returns a logged-in SMTP connection, reusing the previous one if it is still alive.
+        The caller must hold self._smtp_lock.
 
-        msg["From"] = smtp_user
-        recipients = [email.strip() for email in self.experiment_info["email_recipients"].split(",")]
-        msg["To"] = ", ".join(recipients)
-        msg.attach(MIMEText(body, 'plain'))
+        Args:
+            smtp_user (str): The SMTP username.
+            smtp_password (str): The SMTP password.
 
-        smtp_server = "smtp.gmail.com"
-        smtp_port = 587
+        Returns:
+            smtplib.SMTP: The SMTP connection.
+        """
+        if self._smtp is not None:
+            try:
+                self._smtp.noop()
+                return self._smtp
+            except (smtplib.SMTPException, OSError):
+                log.info("SMTP connection lost, reconnecting...")
+                self._close_smtp()
 
+        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
         try:
-            with smtplib.SMTP(smtp_server, smtp_port) as server:
-                server.starttls()
-                server.login(smtp_user, smtp_password)
-                server.sendmail(msg["From"], recipients, msg.as_string())
-            logging.info("Email notification sent successfully.")
-        except Exception as e:
-            logging.exception(f"Failed to send email: {e}")
+            server.starttls()
+            server.login(smtp_user, smtp_password)
+        except Exception:
+            server.close()
+            raise
+        self._smtp = server
+        return server
 
-    def run_simplex_basecalling(self, file_path):
+    def _close_smtp(self):
+        """Closes the SMTP connection, if one is open. The caller must hold self._smtp_lock."""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
+
+    def _build_command_template(self):
         """
-        Performs simplex basecalling.
+        Builds the Dorado command for the configured basecalling method.
+
+        Everything but the pod5 folder and the output file is fixed for the
+        experiment, so the command is formatted once; the '{pod5_folder}' and
+        '{output_file}' items are replaced for each job.
+
+        Returns:
+            tuple or None: The command template and the output file name, or None
+            if the basecalling method is unknown.
+        """
+        method = self.experiment_info.get("basecalling_method")
+        if method not in BASECALLING_COMMANDS:
+            return None
+        subcommand, arg_templates, output_name = BASECALLING_COMMANDS[method]
+        fields = dict(self.experiment_info, pod5_folder="{pod5_folder}", output_file="{output_file}")
+        command = [self.experiment_info["dorado"], subcommand] + [arg.format(**fields) for arg in arg_templates]
+        # Empty unless the watcher is pinned to a CPU; then it runs Dorado on the original CPUs
+        command = self.experiment_info.get("dorado_prefix", []) + command
+        for option in DORADO_OPTIONAL_OPTIONS:
+            if self.experiment_info.get(option):
+                command += [f"--{option}", str(self.experiment_info[option])]
+        return command, output_name
+
+    def _has_output(self, file_path):
+        """Returns whether the basecalling output for a final summary file exists."""
+        return os.path.exists(os.path.join(os.path.dirname(file_path), self._command_template[1]))
+
+    def run_basecalling(self, file_path):
+        """
+        Performs simplex or duplex basecalling, as configured.
 
         Args:
             file_path (str): The path to the final summary file.
+
+        Returns:
+            bool: True if basecalling succeeded, False otherwise.
         """
-        logging.info("Running simplex basecalling...")
-        pod5_folder = self.find_pod5_folder(file_path)
+        log.info("Running %s basecalling...", self.experiment_info["basecalling_method"])
+        run_dir = os.path.dirname(file_path)
+        pod5_folder = self.find_pod5_folder(run_dir)
         if not pod5_folder:
-            logging.error("pod5 folder not found.")
-            return
-        output_folder = os.path.dirname(file_path)
-        output_file = os.path.join(output_folder, "simplex_basecalled.bam")
-
-        command = [
-            "dorado",
-            "basecaller",
-            self.experiment_info["model"],
-            "--simplex",
-            "--kit",
-            self.experiment_info["kit_name"],
-            pod5_folder,
-            "--output",
-            output_file
-        ]
+            return False
+        command_template, output_name = self._command_template
+        output_file = os.path.join(run_dir, output_name)
+        # Dorado writes to a partial file that is renamed once it succeeds, so an
+        # output file cut short by a crash or power loss is never taken for a finished one
+        partial_file = output_file + ".partial"
+        job_fields = {"{pod5_folder}": pod5_folder, "{output_file}": partial_file}
+        command = [job_fields.get(arg, arg) for arg in command_template]
+        log_path = output_file + ".log"
 
-        self.run_basecalling(command, output_file)
+        try:
+            # Dorado writes straight to the file descriptors; Python never touches the data.
+            # Progress and errors go to a log file next to the output.
+            with open(log_path, 'ab', buffering=0) as dorado_log:
+                log_offset = dorado_log.tell()
+                if "{output_file}" in command_template:
+                    log.info("Executing command: %s", ' '.join(command))
+                    returncode = self._run_process(command, dorado_log, dorado_log)
+                else:
+                    # The command writes its output to stdout, so redirect it to the output file
+                    log.info("Executing command: %s > %s", ' '.join(command), partial_file)
+                    with open(partial_file, 'wb', buffering=0) as outfile:
+                        returncode = self._run_process(command, outfile, dorado_log)
+            if returncode != 0:
+                try:
+                    os.remove(partial_file)
+                except FileNotFoundError:
+                    pass
+                raise subprocess.CalledProcessError(returncode, command)
+            os.replace(partial_file, output_file)
+            log.info("Basecalling completed. Output saved to %s", output_file)
+            if not self.experiment_info.get("batchsize"):
+                self._cache_batch_size(log_path, log_offset)
+        except subprocess.CalledProcessError as e:
+            log.error("Basecalling failed with error: %s", e)
+            return False
+        except Exception as e:
+            log.exception("An unexpected error occurred during basecalling: %s", e)
+            return False
+        finally:
+            log.info("Dorado log saved to %s", log_path)
+        return True
 
-    
-    def run_duplex_basecalling(self, file_path):
+    def _cache_batch_size(self, log_path, offset):
         """
-        Performs duplex basecalling.
+        Passes the batch size Dorado benchmarked for a run to all later runs.
+
+        Without --batchsize Dorado spends minutes benchmarking every GPU before
+        each run. The batch size it chose is read from the run's log and added to
+        the command template; with several GPUs the smallest one is used, so it
+        fits on every device.
+
+        Duplex basecalling also benchmarks the stereo model, after the simplex
+        model, so only the first batch size reported for each device is used.
 
         Args:
-            file_path (str): The path to the final summary file.
+            log_path (str): The Dorado log file of the run.
+            offset (int): The position in the log file where the run's output starts.
         """
-        logging.info("Running duplex basecalling...")
-        pod5_folder = self.find_pod5_folder(file_path)
-        if not pod5_folder:
-            logging.error("pod5 folder not found.")
+        with open(log_path, 'rb') as f:
+            f.seek(offset)
+            device_batch_sizes = {}
+            for device, size in DORADO_BATCH_SIZE_RE.findall(f.read()):
+                device_batch_sizes.setdefault(device, int(size))
+        if not device_batch_sizes:
             return
-        output_folder = os.path.dirname(file_path)
-        output_file = os.path.join(output_folder, "duplex_basecalled.bam")
+        with self._lock:
+            if self.experiment_info.get("batchsize"):
+                return
+            self.experiment_info["batchsize"] = min(device_batch_sizes.values())
+            self._command_template = self._build_command_template()
+        log.info("Using Dorado's benchmarked batch size %d for later runs.", self.experiment_info["batchsize"])
 
-        command = [
-            "dorado",
-            "duplex",
-            self.experiment_info["model"],
-            pod5_folder
-        ]
+    def _run_process(self, command, stdout, stderr):
+        """
+        Runs a command to completion in its own session.
+
+        The session keeps a Ctrl+C meant for the watcher from reaching the
+        command; use abort_jobs() to stop it.
 
-        # If needed, add additional arguments here
-        # For example, if you want to specify the output in BAM format, Dorado by default outputs BAM
+        Args:
+            command (list): The command to run.
+            stdout (file): The file receiving the command's stdout.
+            stderr (file): The file receiving the command's stderr.
 
-        # Since the 'duplex' command writes output to stdout, we'll redirect it to the output file
+        Returns:
+            int: The return code of the command.
+        """
+        process = subprocess.Popen(command, stdout=stdout, stderr=stderr, close_fds=True,
+                                   start_new_session=True)
+        with self._lock:
+            self._processes.add(process)
         try:
-            logging.info(f"Executing command: {' '.join(command)} > {output_file}")
-            with open(output_file, 'w') as outfile:
-                subprocess.run(command, check=True, stdout=outfile)
-            logging.info(f"Duplex basecalling completed. Output saved to {output_file}")
-        except subprocess.CalledProcessError as e:
-            logging.error(f"Duplex basecalling failed with error: {e}")
-        except Exception as e:
-            logging.exception(f"An unexpected error occurred during duplex basecalling: {e}")
+            return process.wait()
+        finally:
+            with self._lock:
+                self._processes.discard(process)
 
+    def abort_jobs(self):
+        """
+        Terminates the running basecalling processes, if any.
 
-        self.run_basecalling(command, output_file)
+        Called from the signal handler, which may interrupt the main thread while
+        it holds self._lock, so the lock is not taken; set.copy() is atomic.
+        """
+        processes = self._processes.copy()
+        for process in processes:
+            if process.poll() is None:
+                log.info("Terminating basecalling process %d...", process.pid)
+                process.terminate()
 
-    def find_pod5_folder(self, file_path):
+    def find_pod5_folder(self, run_dir):
         """
-        Finds the 'pod5' folder associated with the final summary file.
+        Finds the 'pod5' folder associated with a final summary file.
 
         Args:
-            file_path (str): The path to the final summary file.
+            run_dir (str): The folder containing the final summary file.
 
         Returns:
             str or None: Path to the pod5 folder or None if not found.
         """
-        # Assuming 'pod5' folder is in the same directory or up to two levels up
-        current_dir = os.path.dirname(file_path)
-        for _ in range(3):  # Check current dir and two levels up
-            pod5_path = os.path.join(current_dir, "pod5")
-            logging.debug(f"Checking for pod5 folder at: {pod5_path}")
-            if os.path.isdir(pod5_path):
-                logging.info(f"Found pod5 folder at: {pod5_path}")
-                return pod5_path
-            current_dir = os.path.dirname(current_dir)
-        logging.error("pod5 folder not found.")
-        return None
+        pod5_path = self._pod5_cache.get(run_dir)
+        if pod5_path is None:
+            pod5_path = locate_pod5_folder(run_dir)
+            if pod5_path:
+                # The layout of a run does not change, but a missing folder may still appear
+                self._pod5_cache[run_dir] = pod5_path
+        if pod5_path:
+            log.info("Found pod5 folder at: %s", pod5_path)
+        else:
+            log.error("pod5 folder not found.")
+        return pod5_path
 
-    def run_basecalling(self, command, output_file):
-        try:
-            # Use the full path to the Windows-installed Dorado with the path wrapped in quotes
-            command[0] = "/mnt/c/Users/Lai Lab/Documents/dorado-0.7.3-win64/bin/dorado.exe"
-            logging.info(f"Executing command: {' '.join(command)}")
-            subprocess.run(command, check=True)
-            logging.info(f"Basecalling completed. Output saved to {output_file}")
-        except subprocess.CalledProcessError as e:
-            logging.error(f"Basecalling failed with error: {e}")
-        except Exception as e:
-            logging.exception(f"An unexpected error occurred during basecalling: {e}")
+    def stop(self):
+        """
+        Stops the observer and prevents queued jobs from starting.
+
+        Takes self._lock, so it must not be called from a signal handler.
+        """
+        self.stopping.set()
+        with self._pending_changed:
+            self._pending_changed.notify_all()
+        self.observer.stop()
+
+
+class InotifyObserver:
+    """
+    Watches a directory tree for final summary files through a single inotify file descriptor.
+
+    Linux only, and requires the optional inotify_simple package. Unlike the watchdog
+    observers it runs no thread and queues no events: main() reads the descriptor on
+    the main thread and summaries are passed straight to the handler. Read folders
+    (pod5, fastq_pass, ...) are not watched, so the files written there cost nothing.
+    It provides the observer methods used by main() and FileWatcher.
+    """
+
+    def __init__(self):
+        self._inotify = INotify()
+        # Watch descriptor -> watched directory
+        self._watches = {}
+        self._handler = None
+        self._root = None
 
+    def schedule(self, event_handler, path, recursive=True):
+        """Sets the handler and the directory tree to watch; subfolders are always watched."""
+        self._handler = event_handler
+        self._root = path
+
+    def start(self):
+        """Adds a watch for every folder of the tree."""
+        self._watch_tree(self._root)
 
     def stop(self):
-        """Stops the observer."""
-        self.observer.stop()
+        """Nothing to stop: events are only read while main() waits."""
+
+    def is_alive(self):
+        """Returns whether the inotify descriptor is still open."""
+        return not self._inotify.closed
+
+    def join(self):
+        """Closes the inotify descriptor, removing all watches."""
+        self._inotify.close()
+
+    def fileno(self):
+        """Returns the inotify descriptor, readable when events are pending."""
+        return self._inotify.fileno()
+
+    def _watch_tree(self, root):
+        """
+        Adds watches for a folder and its subfolders, except read folders.
+
+        A folder's contents can be created before its watch is added, so the
+        summaries already present are returned for the caller to handle.
+
+        Args:
+            root (str): The folder to watch.
+
+        Returns:
+            list: Paths of the final summary files found in the tree.
+        """
+        try:
+            wd = self._inotify.add_watch(
+                root, inotify_flags.CREATE | inotify_flags.MOVED_TO | inotify_flags.ONLYDIR)
+        except OSError as e:
+            # ENOSPC means fs.inotify.max_user_watches is exhausted
+            log.warning("Could not watch directory %s: %s", root, e)
+            return []
+        self._watches[wd] = root
+        summaries, subdirs = scan_directory(root)
+        for subdir in subdirs:
+            summaries.extend(self._watch_tree(subdir))
+        return summaries
+
+    def dispatch_events(self):
+        """Reads the pending inotify events and passes final summary files to the handler."""
+        for event in self._inotify.read(timeout=0):
+            if event.mask & inotify_flags.Q_OVERFLOW:
+                log.warning("inotify event queue overflowed, rescanning %s", self._root)
+                for file_path in self._watch_tree(self._root):
+                    self._handler.handle_summary(file_path)
+                continue
+            if event.mask & inotify_flags.IGNORED:
+                self._watches.pop(event.wd, None)
+                continue
+            parent = self._watches.get(event.wd)
+            if parent is None:
+                continue
+            path = os.path.join(parent, event.name)
+            if event.mask & inotify_flags.ISDIR:
+                # New subfolders must be watched separately
+                if event.name not in READ_FOLDER_NAMES:
+                    for file_path in self._watch_tree(path):
+                        self._handler.handle_summary(file_path)
+            elif SUMMARY_PATH_RE.match(event.name):
+                self._handler.handle_summary(path)
+
+
+def find_summaries(root):
+    """
+    Finds existing 'final_summary*.txt' files below a directory.
+
+    Read folders (pod5, fastq_pass, ...) are not entered, and file names are
+    matched before the file type is checked so most entries need no extra stat call.
+
+    Args:
+        root (str): The directory to search.
+
+    Yields:
+        str: Path to each final summary file found.
+    """
+    summaries, subdirs = scan_directory(root)
+    yield from summaries
+    for subdir in subdirs:
+        yield from find_summaries(subdir)
+
+
+def find_summaries_parallel(root, max_workers=STARTUP_SCAN_WORKERS):
+    """
+    Finds existing 'final_summary*.txt' files below a directory, searching each
+    top-level folder on its own thread so that network round trips overlap.
+
+    Args:
+        root (str): The directory to search.
+        max_workers (int): The number of folders searched at once.
+
+    Returns:
+        list: Paths of the final summary files found.
+    """
+    summaries, subdirs = scan_directory(root)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for found in executor.map(lambda subdir: list(find_summaries(subdir)), subdirs):
+            summaries.extend(found)
+    return summaries
+
+
+def scan_directory(root):
+    """
+    Lists the final summary files and searchable subfolders of a single directory.
+
+    Args:
+        root (str): The directory to list.
+
+    Returns:
+        tuple: Lists of final summary file paths and subfolder paths.
+    """
+    is_summary = SUMMARY_PATH_RE.match
+    summaries = []
+    subdirs = []
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if is_summary(entry.name):
+                    if entry.is_file():
+                        summaries.append(entry.path)
+                elif entry.name not in READ_FOLDER_NAMES and entry.is_dir():
+                    subdirs.append(entry.path)
+    except OSError as e:
+        log.warning("Could not scan directory %s: %s", root, e)
+    return summaries, subdirs
+
+
+def find_experiment_folder(data_path, experiment_date):
+    """
+    Finds the most recently modified experiment folder for a date.
+
+    Experiment folders are the top-level folders of the data path whose names
+    start with the date, so only that one directory is listed.
+
+    Args:
+        data_path (str): The root folder containing all experiment data.
+        experiment_date (str): The experiment date in YYYYMMDD format.
+
+    Returns:
+        str or None: Path to the experiment folder or None if not found.
+    """
+    with os.scandir(data_path) as entries:
+        candidates = [(entry.stat().st_mtime, entry.path) for entry in entries
+                      if entry.name.startswith(experiment_date) and entry.is_dir()]
+    return max(candidates)[1] if candidates else None
+
+
+def locate_pod5_folder(run_dir):
+    """
+    Finds the 'pod5' folder in a run folder or up to two levels above it.
+
+    Args:
+        run_dir (str): The folder containing the final summary file.
+
+    Returns:
+        str or None: Path to the pod5 folder or None if not found.
+    """
+    current_dir = run_dir
+    for _ in range(3):  # Check current dir and two levels up
+        pod5_path = os.path.join(current_dir, "pod5")
+        log.debug("Checking for pod5 folder at: %s", pod5_path)
+        try:
+            if stat.S_ISDIR(os.stat(pod5_path).st_mode):
+                return pod5_path
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            # Unlike os.path.isdir, report errors such as permission problems or stale network mounts
+            log.warning("Could not check %s: %s", pod5_path, e)
+        current_dir = os.path.dirname(current_dir)
+    return None
+
+
+def positive_int(value):
+    """
+    Parses a command-line argument that must be a positive integer.
+
+    Args:
+        value (str): The argument as given on the command line.
+
+    Returns:
+        int: The parsed value.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a positive integer.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
 def get_experiment_info():
@@ -250,72 +940,199 @@ def get_experiment_info():
     """
     parser = argparse.ArgumentParser(description='Nanopore Sequencing Data Processing')
     parser.add_argument('--path', required=True, help='Path to the experiment directory')
-    parser.add_argument('--basecalling_method', default='duplex', choices=['simplex', 'duplex'],
+    parser.add_argument('--date',
+                        help='Experiment date (YYYYMMDD); monitors the most recent matching folder under --path')
+    parser.add_argument('--basecalling_method', default='duplex', choices=sorted(BASECALLING_COMMANDS),
                         help='Basecalling method (default: duplex)')
     parser.add_argument('--model', default='sup', help='Model for basecalling (default: sup)')
+    parser.add_argument('--device', help='Device(s) used by Dorado (default: chosen automatically by Dorado)')
+    parser.add_argument('--batchsize', type=int,
+                        help='Dorado batch size (default: chosen automatically by Dorado)')
+    parser.add_argument('--chunksize', type=int,
+                        help='Dorado chunk size (default: chosen automatically by Dorado)')
     parser.add_argument('--kit_name', default='SQK-NBD114-24', help='Kit name (default: SQK-NBD114-24)')
     parser.add_argument('--email_recipients', default='hgu1@uw.edu', help='Comma-separated email recipients')
+    parser.add_argument('--parallel_jobs', type=positive_int, default=1,
+                        help='Number of final summary files processed at the same time (default: 1)')
+    parser.add_argument('--observer', default='polling', choices=['polling', 'native', 'inotify'],
+                        help='Use periodic polling, native file system notifications, or a single inotify '
+                             'descriptor read on the main thread (Linux, needs inotify_simple) (default: polling)')
+    parser.add_argument('--poll_interval', type=float, default=60,
+                        help='Seconds between scans of the experiment directory (default: 60)')
+    parser.add_argument('--log_file', default='nanopore_processor.log',
+                        help='Path to the rotating log file (default: nanopore_processor.log)')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Also log to stdout, including DEBUG messages')
+    parser.add_argument('--models_directory',
+                        help='Folder where Dorado keeps downloaded models between runs '
+                             '(default: .dorado_models in the experiment directory)')
     args = parser.parse_args()
+    if args.models_directory is None:
+        args.models_directory = os.path.join(args.path, ".dorado_models")
     return vars(args)
 
 
+def pin_watcher_cpu():
+    """
+    Pins the watcher to the CPU named by the NP_WATCHER_CPU environment variable,
+    so it does not compete with Dorado for CPU time.
+
+    Must be called before any threads are started, as they inherit the
+    affinity of the thread that creates them. Dorado would inherit it too, so
+    it is started through taskset with the CPUs the watcher had before.
+
+    Returns:
+        list: The command prefix that starts Dorado on the original CPUs, or an
+        empty list if the watcher was not pinned.
+    """
+    cpu = os.environ.get("NP_WATCHER_CPU")
+    if not cpu:
+        return []
+    taskset = shutil.which("taskset")
+    if not taskset:
+        log.warning("Not pinning the watcher to CPU %s: taskset, needed to unpin Dorado, was not found.", cpu)
+        return []
+    try:
+        cpus = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, {int(cpu)})
+    except (AttributeError, OSError, ValueError) as e:
+        log.warning("Could not pin the watcher to CPU %s: %s", cpu, e)
+        return []
+    log.info("Pinned the watcher to CPU %s.", cpu)
+    return [taskset, "--cpu-list", ",".join(str(c) for c in sorted(cpus))]
+
+
+def find_dorado():
+    """
+    Resolves the Dorado executable once, so a missing installation is reported at startup.
+
+    Returns:
+        str or None: Full path to the Dorado executable or None if not found.
+    """
+    dorado_bin = os.environ.get("DORADO_BIN")
+    candidates = [dorado_bin] if dorado_bin else [DORADO_PATH, "dorado"]
+    for candidate in candidates:
+        dorado = shutil.which(candidate)
+        if dorado:
+            return dorado
+    return None
+
+
+def wait_until_stopped(stopping, inotify_observer=None):
+    """
+    Blocks the main thread until a signal handler sets the stopping event.
+
+    Signals are delivered through a wakeup socket watched by a selector, so the
+    thread never wakes up periodically, and a signal arriving just before the
+    wait starts is not missed.
+
+    Args:
+        stopping (threading.Event): The event set when the watcher is stopping.
+        inotify_observer (InotifyObserver): An observer whose events are dispatched
+            while waiting, or None.
+    """
+    wakeup_read, wakeup_write = socket.socketpair()
+    wakeup_write.setblocking(False)
+    previous_fd = signal.set_wakeup_fd(wakeup_write.fileno())
+    try:
+        with selectors.DefaultSelector() as selector:
+            selector.register(wakeup_read, selectors.EVENT_READ)
+            if inotify_observer is not None:
+                selector.register(inotify_observer.fileno(), selectors.EVENT_READ)
+            while not stopping.is_set():
+                for key, _ in selector.select():
+                    if key.fileobj is wakeup_read:
+                        wakeup_read.recv(4096)
+                    else:
+                        inotify_observer.dispatch_events()
+    finally:
+        signal.set_wakeup_fd(previous_fd)
+        wakeup_read.close()
+        wakeup_write.close()
+
+
 def main():
     """Main function to start the file watcher."""
-    setup_logging()
     experiment_info = get_experiment_info()
+    setup_logging(experiment_info["log_file"], experiment_info["verbose"])
+    experiment_info["dorado_prefix"] = pin_watcher_cpu()
 
     data_path = experiment_info["path"]
 
+    if os.path.isdir(data_path) and experiment_info["date"]:
+        experiment_folder = find_experiment_folder(data_path, experiment_info["date"])
+        if not experiment_folder:
+            log.error("No experiment folder found for date %s in %s", experiment_info['date'], data_path)
+            return
+        log.info("Found experiment folder: %s", experiment_folder)
+        data_path = experiment_info["path"] = experiment_folder
+
     if os.path.isdir(data_path):
-        logging.info(f"Monitoring path: {data_path} recursively")
+        experiment_info["dorado"] = find_dorado()
+        if not experiment_info["dorado"]:
+            log.error("Dorado executable not found. Add it to the PATH or set the DORADO_BIN environment variable.")
+            return
+        log.info("Using Dorado at: %s", experiment_info["dorado"])
+        log.info("Monitoring path: %s recursively", data_path)
+        os.makedirs(experiment_info["models_directory"], exist_ok=True)
 
-        # Use PollingObserver for environments where file system events are unreliable
-        # observer = Observer()
-        from watchdog.observers.polling import PollingObserver
-        observer = PollingObserver()
+        if experiment_info["observer"] == "inotify":
+            if INotify is None:
+                log.error("The inotify observer requires the inotify_simple package (pip install inotify_simple).")
+                return
+            observer = InotifyObserver()
+        elif experiment_info["observer"] == "native":
+            # Kernel notifications: inotify on Linux, FSEvents on macOS, ReadDirectoryChangesW on Windows
+            observer = Observer()
+        else:
+            # Use PollingObserver for environments where file system events are unreliable.
+            # A final summary appears once per multi-hour run, so a long interval is sufficient.
+            observer = PollingObserver(timeout=experiment_info.get("poll_interval", 60))
 
         event_handler = FileWatcher(experiment_info, observer)
-        observer.schedule(event_handler, path=data_path, recursive=True)
-        observer.start()
-        logging.info("File watcher started.")
-
-        # Process existing final_summary files upon startup
-        logging.info("Checking for existing final_summary files...")
-        try:
-            for root, dirs, files in os.walk(data_path, followlinks=True):
-                logging.debug(f"Entering directory: {root}")
-                for file_name in files:
-                    logging.debug(f"Found file: {file_name}")
-                    if file_name.endswith(".txt") and file_name.startswith("final_summary"):
-                        file_path = os.path.join(root, file_name)
-                        if file_path not in event_handler.processed_files:
-                            logging.info(f"Processing existing final summary file: {file_path}")
-                            event_handler.process_file(file_path)
-                            event_handler.processed_files.add(file_path)
-                        else:
-                            logging.debug(f"File {file_path} has already been processed.")
-        except Exception as e:
-            logging.exception(f"An error occurred while traversing directories: {e}")
 
         def signal_handler(sig, frame):
-            logging.info('Script terminated by user.')
-            event_handler.stop()
-            observer.join()
-            sys.exit(0)
+            # The main thread may hold the watcher's lock when interrupted, so only set the event here;
+            # the wakeup fd ends wait_until_stopped(), and the finally block below stops the watcher.
+            if event_handler.stopping.is_set():
+                log.info('Second termination request, aborting running jobs.')
+                event_handler.abort_jobs()
+                return
+            log.info('Script terminated by user. Waiting for running jobs to finish; '
+                     'press Ctrl+C again to abort them.')
+            event_handler.stopping.set()
 
         signal.signal(signal.SIGINT, signal_handler)
+        signal.signal(signal.SIGTERM, signal_handler)
 
         try:
-            while True:
-                time.sleep(1)
+            observer.schedule(event_handler, path=data_path, recursive=True)
+            observer.start()
+            log.info("File watcher started.")
+
+            # Process existing final_summary files upon startup
+            log.info("Checking for existing final_summary files...")
+            try:
+                for file_path in find_summaries_parallel(data_path):
+                    if event_handler.submit_file(file_path):
+                        log.info("Queued existing final summary file: %s", file_path)
+                    else:
+                        log.debug("File %s has already been processed or queued.", file_path)
+            except Exception as e:
+                log.exception("An error occurred while traversing directories: %s", e)
+
+            wait_until_stopped(event_handler.stopping,
+                               observer if isinstance(observer, InotifyObserver) else None)
         except Exception as e:
-            logging.exception(f"An unexpected error occurred: {e}")
+            log.exception("An unexpected error occurred: %s", e)
         finally:
-            observer.stop()
-            observer.join()
-            logging.info("File watcher stopped.")
+            event_handler.stop()
+            if observer.is_alive():
+                observer.join()
+            event_handler.wait_for_jobs()
+            log.info("File watcher stopped.")
     else:
-        logging.error(f"Data path does not exist: {data_path}")
+        log.error("Data path does not exist: %s", data_path)
 
 
 if __name__ == "__main__":